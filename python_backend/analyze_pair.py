@@ -4,143 +4,12 @@ import json
 import requests
 import pandas as pd
 import numpy as np
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.trend import EMAIndicator, MACD
-from ta.volatility import BollingerBands
 from datetime import datetime, timedelta
+from data_router import DataRouter, CoinGeckoSource, YahooFinanceSource, TIMEFRAMES, DATA_SOURCE_LABELS, get_coingecko_id
+from indicators import compute_indicators, score_extended_indicators, extended_indicator_values
 import warnings
 warnings.filterwarnings('ignore')
 
-# CoinGecko ID mapping for common trading pairs
-PAIR_TO_COINGECKO_ID = {
-    'BTCUSDT': 'bitcoin',
-    'ETHUSDT': 'ethereum',
-    'ADAUSDT': 'cardano',
-    'DOTUSDT': 'polkadot',
-    'LINKUSDT': 'chainlink',
-    'BNBUSDT': 'binancecoin',
-    'SOLUSDT': 'solana',
-    'MATICUSDT': 'polygon',
-    'AVAXUSDT': 'avalanche-2',
-    'LTCUSDT': 'litecoin',
-    'XRPUSDT': 'ripple',
-    'ATOMUSDT': 'cosmos',
-    'ALGOUSDT': 'algorand',
-    'VETUSDT': 'vechain',
-    'FILUSDT': 'filecoin',
-    'PEPEUSDT': 'pepe',
-    'SHIBUSDT': 'shiba-inu',
-    'DOGEUSDT': 'dogecoin',
-    'FLOKIUSDT': 'floki',
-    'BONKUSDT': 'bonk',
-    'WIFUSDT': 'dogwifcoin',
-}
-
-def get_coingecko_id(symbol: str):
-    """Convert trading pair symbol to CoinGecko ID"""
-    # Try direct mapping first
-    if symbol in PAIR_TO_COINGECKO_ID:
-        return PAIR_TO_COINGECKO_ID[symbol]
-    
-    # Try to extract base currency and convert to lowercase
-    if symbol.endswith('USDT'):
-        base_currency = symbol[:-4].lower()
-        
-        # Common mappings for meme coins and others
-        special_mappings = {
-            'pepe': 'pepe',
-            'shib': 'shiba-inu',
-            'doge': 'dogecoin',
-            'floki': 'floki',
-            'bonk': 'bonk',
-            'wif': 'dogwifcoin',
-            'btc': 'bitcoin',
-            'eth': 'ethereum',
-            'ada': 'cardano',
-            'dot': 'polkadot',
-            'link': 'chainlink',
-            'bnb': 'binancecoin',
-            'sol': 'solana',
-            'matic': 'polygon',
-            'avax': 'avalanche-2',
-            'ltc': 'litecoin',
-            'xrp': 'ripple',
-            'atom': 'cosmos',
-            'algo': 'algorand',
-            'vet': 'vechain',
-            'fil': 'filecoin',
-        }
-        
-        return special_mappings.get(base_currency, base_currency)
-    
-    return symbol.lower()
-
-def get_coingecko_market_data(coin_id: str, days: int = 7):
-    """Fetch market chart data from CoinGecko and convert to OHLC"""
-    try:
-        url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
-        params = {
-            'vs_currency': 'usd',
-            'days': days
-            # Automatic interval based on days parameter (CoinGecko free plan)
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if 'prices' not in data or not data['prices']:
-            return None
-        
-        # Convert prices data to DataFrame
-        prices_df = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
-        
-        if len(prices_df) < 50:
-            return None
-        
-        # Convert timestamp to datetime
-        prices_df['timestamp'] = pd.to_datetime(prices_df['timestamp'], unit='ms')
-        
-        # Create OHLC data by grouping hourly prices
-        # Since we only have price data, we'll simulate OHLC by using price movements
-        df_list = []
-        for i in range(len(prices_df)):
-            if i == 0:
-                open_price = prices_df.iloc[i]['price']
-                high_price = prices_df.iloc[i]['price']
-                low_price = prices_df.iloc[i]['price']
-                close_price = prices_df.iloc[i]['price']
-            else:
-                # Use previous close as open
-                open_price = df_list[-1]['Close'] if df_list else prices_df.iloc[i-1]['price']
-                close_price = prices_df.iloc[i]['price']
-                
-                # Simulate high/low based on price movement
-                price_change = abs(close_price - open_price)
-                volatility_factor = price_change * 0.1  # Small volatility simulation
-                
-                high_price = max(open_price, close_price) + volatility_factor
-                low_price = min(open_price, close_price) - volatility_factor
-            
-            df_list.append({
-                'timestamp': prices_df.iloc[i]['timestamp'],
-                'Open': open_price,
-                'High': high_price,
-                'Low': low_price,
-                'Close': close_price,
-                'Volume': 1000000  # Placeholder volume
-            })
-        
-        df = pd.DataFrame(df_list)
-        df.set_index('timestamp', inplace=True)
-        
-        return df[['Open', 'High', 'Low', 'Close', 'Volume']]
-        
-    except Exception as e:
-        print(f"Error fetching CoinGecko market data for {coin_id}: {e}", file=sys.stderr)
-        return None
-
 def get_current_price_data(coin_id: str):
     """Get current price and 24h change from CoinGecko"""
     try:
@@ -148,7 +17,8 @@ def get_current_price_data(coin_id: str):
         params = {
             'ids': coin_id,
             'vs_currencies': 'usd',
-            'include_24hr_change': 'true'
+            'include_24hr_change': 'true',
+            'include_24hr_vol': 'true'
         }
         
         response = requests.get(url, params=params, timeout=5)
@@ -159,7 +29,8 @@ def get_current_price_data(coin_id: str):
         if coin_id in data:
             return {
                 'current_price': data[coin_id]['usd'],
-                'price_change_24h': data[coin_id].get('usd_24h_change', 0)
+                'price_change_24h': data[coin_id].get('usd_24h_change', 0),
+                'volume_24h': data[coin_id].get('usd_24h_vol')
             }
         
         return None
@@ -173,47 +44,18 @@ def calculate_indicators(data: pd.DataFrame):
     try:
         if len(data) < 50:
             return None
-            
-        # RSI
-        rsi = RSIIndicator(data['Close'], window=14).rsi()
-        
-        # EMA
-        ema_short = EMAIndicator(data['Close'], window=12).ema_indicator()
-        ema_long = EMAIndicator(data['Close'], window=26).ema_indicator()
         
-        # Stochastic
-        stoch = StochasticOscillator(
-            high=data['High'], 
-            low=data['Low'], 
-            close=data['Close'],
-            window=14,
-            smooth_window=3
-        )
-        
-        # MACD
-        macd = MACD(data['Close'])
-        
-        # Bollinger Bands
-        bb = BollingerBands(data['Close'], window=20)
-        
-        return {
-            'rsi': rsi,
-            'ema_short': ema_short,
-            'ema_long': ema_long,
-            'stoch_k': stoch.stoch(),
-            'stoch_d': stoch.stoch_signal(),
-            'macd': macd.macd(),
-            'macd_signal': macd.macd_signal(),
-            'bb_upper': bb.bollinger_hband(),
-            'bb_middle': bb.bollinger_mavg(),
-            'bb_lower': bb.bollinger_lband()
-        }
+        # RSI, EMA, Stochastic, MACD, Bollinger Bands, VWAP, ATR, OBV and ADX in one pass
+        return compute_indicators(data)
     except Exception as e:
         print(f"Error calculating indicators: {e}", file=sys.stderr)
         return None
 
-def generate_signal(data: pd.DataFrame, indicators: dict):
-    """Generate trading signal based on technical indicators"""
+def generate_signal(data: pd.DataFrame, indicators: dict, use_extended: bool = False):
+    """Generate trading signal based on technical indicators
+    
+    With use_extended, VWAP, OBV and ADX are scored alongside the base indicators.
+    """
     if len(data) < 50:
         return {
             'signal': 'HOLD',
@@ -227,6 +69,10 @@ def generate_signal(data: pd.DataFrame, indicators: dict):
                 'stoch_d': None,
                 'macd': None,
                 'macd_signal': None,
+                'vwap': None,
+                'atr': None,
+                'obv': None,
+                'adx': None,
                 'current_price': float(data['Close'].iloc[-1])
             }
         }
@@ -296,6 +142,13 @@ def generate_signal(data: pd.DataFrame, indicators: dict):
             sell_signals += 1
         total_signals += 1
         
+        # Optional volume/trend-strength components
+        if use_extended:
+            extra_buy, extra_sell, extra_total = score_extended_indicators(data, indicators)
+            buy_signals += extra_buy
+            sell_signals += extra_sell
+            total_signals += extra_total
+        
         # Calculate confidence and determine signal
         buy_confidence = (buy_signals / total_signals) * 100
         sell_confidence = (sell_signals / total_signals) * 100
@@ -325,6 +178,7 @@ def generate_signal(data: pd.DataFrame, indicators: dict):
                 'stoch_d': round(float(latest_stoch_d), 2) if pd.notna(latest_stoch_d) else None,
                 'macd': round(float(latest_macd), 12) if pd.notna(latest_macd) else None,
                 'macd_signal': round(float(latest_macd_signal), 12) if pd.notna(latest_macd_signal) else None,
+                **extended_indicator_values(indicators),
                 'current_price': round(float(current_price), 10)  # High precision for low-value coins
             }
         }
@@ -343,6 +197,10 @@ def generate_signal(data: pd.DataFrame, indicators: dict):
                 'stoch_d': None,
                 'macd': None,
                 'macd_signal': None,
+                'vwap': None,
+                'atr': None,
+                'obv': None,
+                'adx': None,
                 'current_price': float(data['Close'].iloc[-1])
             }
         }
@@ -354,13 +212,22 @@ def main():
     
     pair = sys.argv[1].upper()
     timeframe = sys.argv[2] if len(sys.argv) > 2 else '15m'
+    use_extended = len(sys.argv) > 3 and sys.argv[3] == 'extended'
+    
+    if timeframe not in TIMEFRAMES:
+        print(json.dumps({
+            'error': f'Unsupported timeframe: {timeframe}',
+            'supported_timeframes': list(TIMEFRAMES)
+        }))
+        sys.exit(1)
     
     try:
         # Get CoinGecko coin ID
         coin_id = get_coingecko_id(pair)
         
-        # Fetch market data from CoinGecko
-        crypto_data = get_coingecko_market_data(coin_id, days=7)
+        # Fetch market data from the fastest healthy source (CoinGecko preferred)
+        router = DataRouter(sources=[CoinGeckoSource(), YahooFinanceSource()])
+        crypto_data, data_source = router.fetch(pair, timeframe)
         
         if crypto_data is None or crypto_data.empty:
             print(json.dumps({
@@ -383,12 +250,13 @@ def main():
             sys.exit(1)
         
         # Generate signal
-        signal_data = generate_signal(crypto_data, indicators)
+        signal_data = generate_signal(crypto_data, indicators, use_extended=use_extended)
         
         # Get current price data
         price_data = get_current_price_data(coin_id)
         current_price = price_data['current_price'] if price_data else float(crypto_data['Close'].iloc[-1])
         price_change_24h = price_data['price_change_24h'] if price_data else None
+        volume_24h = price_data['volume_24h'] if price_data else None
         
         # Prepare response
         response = {
@@ -400,9 +268,10 @@ def main():
             'reason': signal_data['reason'],
             'indicators': signal_data['indicators'],
             'last_price': round(float(current_price), 10),  # High precision for low-value coins
-            'volume': int(crypto_data['Volume'].iloc[-1]) if 'Volume' in crypto_data.columns else None,
+            'volume': int(crypto_data['Volume'].iloc[-1]) if 'Volume' in crypto_data.columns and pd.notna(crypto_data['Volume'].iloc[-1]) else None,
             'price_change_24h': round(float(price_change_24h), 2) if price_change_24h else None,
-            'data_source': 'CoinGecko API',
+            'volume_24h': round(float(volume_24h), 2) if volume_24h else None,
+            'data_source': DATA_SOURCE_LABELS.get(data_source, data_source),
             'coin_id': coin_id
         }
         
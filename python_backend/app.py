@@ -1,10 +1,10 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import ta
 from datetime import datetime, timedelta
+from data_router import DataRouter, TIMEFRAMES, DATA_SOURCE_LABELS
+from indicators import compute_indicators, score_extended_indicators, extended_indicator_values
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -13,95 +13,22 @@ CORS(app)  # Enable CORS for frontend communication
 
 class TechnicalAnalyzer:
     def __init__(self):
-        self.timeframe_map = {
-            '1m': '1m',
-            '5m': '5m', 
-            '15m': '15m',
-            '1h': '1h',
-            '4h': '4h',
-            '1d': '1d',
-            '1w': '1wk'
-        }
+        self.router = DataRouter()
     
-    def get_crypto_data(self, symbol: str, timeframe: str = '15m', period: str = '5d'):
-        """Fetch crypto data from Yahoo Finance"""
+    def get_crypto_data(self, symbol: str, timeframe: str = '15m'):
+        """Fetch crypto data from the fastest healthy source"""
         try:
-            # Convert trading pair to Yahoo Finance format
-            if not symbol.endswith('-USD'):
-                symbol = symbol.replace('USDT', '-USD').replace('BUSD', '-USD')
-            
-            ticker = yf.Ticker(symbol)
-            interval = self.timeframe_map.get(timeframe, '15m')
-            
-            # Get historical data
-            data = ticker.history(period=period, interval=interval)
-            
-            if data.empty:
-                return None
-                
-            return data
+            return self.router.fetch(symbol, timeframe)
             
         except Exception as e:
             print(f"Error fetching data for {symbol}: {e}")
-            return None
-    
-    def calculate_rsi(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate RSI indicator"""
-        from ta.momentum import RSIIndicator
-        return RSIIndicator(data['Close'], window=period).rsi()
-    
-    def calculate_ema(self, data: pd.DataFrame, short_period: int = 12, long_period: int = 26) -> dict:
-        """Calculate EMA indicators"""
-        from ta.trend import EMAIndicator
-        ema_short = EMAIndicator(data['Close'], window=short_period).ema_indicator()
-        ema_long = EMAIndicator(data['Close'], window=long_period).ema_indicator()
-        
-        return {
-            'ema_short': ema_short,
-            'ema_long': ema_long,
-            'ema_diff': ema_short - ema_long
-        }
+            return None, None
     
-    def calculate_stochastic(self, data: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> dict:
-        """Calculate Stochastic oscillator"""
-        from ta.momentum import StochasticOscillator
-        stoch = StochasticOscillator(
-            high=data['High'], 
-            low=data['Low'], 
-            close=data['Close'],
-            window=k_period,
-            smooth_window=d_period
-        )
+    def generate_signal(self, data: pd.DataFrame, use_extended: bool = False) -> dict:
+        """Generate trading signal based on technical indicators
         
-        return {
-            'stoch_k': stoch.stoch(),
-            'stoch_d': stoch.stoch_signal()
-        }
-    
-    def calculate_macd(self, data: pd.DataFrame) -> dict:
-        """Calculate MACD indicator"""
-        from ta.trend import MACD
-        macd = MACD(data['Close'])
-        
-        return {
-            'macd': macd.macd(),
-            'macd_signal': macd.macd_signal(),
-            'macd_diff': macd.macd_diff()
-        }
-    
-    def calculate_bollinger_bands(self, data: pd.DataFrame, period: int = 20) -> dict:
-        """Calculate Bollinger Bands"""
-        from ta.volatility import BollingerBands
-        bb = BollingerBands(data['Close'], window=period)
-        
-        return {
-            'bb_upper': bb.bollinger_hband(),
-            'bb_middle': bb.bollinger_mavg(),
-            'bb_lower': bb.bollinger_lband()
-        }
-    
-    def generate_signal(self, data: pd.DataFrame) -> dict:
-        """Generate trading signal based on technical indicators"""
+        With use_extended, VWAP, OBV and ADX are scored alongside the base indicators.
+        """
         if len(data) < 50:  # Need enough data for analysis
             return {
                 'signal': 'HOLD',
@@ -109,12 +36,14 @@ class TechnicalAnalyzer:
                 'reason': 'Insufficient data for analysis'
             }
         
-        # Calculate indicators
-        rsi = self.calculate_rsi(data)
-        ema = self.calculate_ema(data)
-        stoch = self.calculate_stochastic(data)
-        macd = self.calculate_macd(data)
-        bb = self.calculate_bollinger_bands(data)
+        # Calculate all indicators in a single fused pass
+        indicators = compute_indicators(data)
+        rsi = indicators['rsi']
+        ema = {'ema_short': indicators['ema_short'], 'ema_long': indicators['ema_long'],
+               'ema_diff': indicators['ema_short'] - indicators['ema_long']}
+        stoch = {'stoch_k': indicators['stoch_k'], 'stoch_d': indicators['stoch_d']}
+        macd = {'macd': indicators['macd'], 'macd_signal': indicators['macd_signal']}
+        bb = {'bb_upper': indicators['bb_upper'], 'bb_lower': indicators['bb_lower']}
         
         # Get latest values
         latest_rsi = rsi.iloc[-1] if not rsi.empty else 50
@@ -176,6 +105,13 @@ class TechnicalAnalyzer:
             sell_signals += 1
         total_signals += 1
         
+        # Optional volume/trend-strength components
+        if use_extended:
+            extra_buy, extra_sell, extra_total = score_extended_indicators(data, indicators)
+            buy_signals += extra_buy
+            sell_signals += extra_sell
+            total_signals += extra_total
+        
         # Calculate confidence and determine signal
         buy_confidence = (buy_signals / total_signals) * 100
         sell_confidence = (sell_signals / total_signals) * 100
@@ -205,6 +141,7 @@ class TechnicalAnalyzer:
                 'stoch_d': round(latest_stoch_d, 2),
                 'macd': round(latest_macd, 6),
                 'macd_signal': round(latest_macd_signal, 6),
+                **extended_indicator_values(indicators),
                 'current_price': round(current_price, 4)
             }
         }
@@ -229,8 +166,15 @@ def analyze_trading_pair():
         pair = data['pair'].upper()
         timeframe = data.get('timeframe', '15m')
         
+        if timeframe not in TIMEFRAMES:
+            return jsonify({
+                'error': f'Unsupported timeframe: {timeframe}',
+                'supported_timeframes': list(TIMEFRAMES)
+            }), 400
+        use_extended = bool(data.get('extended', False))
+        
         # Fetch crypto data
-        crypto_data = analyzer.get_crypto_data(pair, timeframe)
+        crypto_data, data_source = analyzer.get_crypto_data(pair, timeframe)
         
         if crypto_data is None or crypto_data.empty:
             return jsonify({
@@ -240,7 +184,7 @@ def analyze_trading_pair():
             }), 404
         
         # Generate signal
-        signal_data = analyzer.generate_signal(crypto_data)
+        signal_data = analyzer.generate_signal(crypto_data, use_extended=use_extended)
         
         # Prepare response
         response = {
@@ -252,10 +196,11 @@ def analyze_trading_pair():
             'reason': signal_data['reason'],
             'indicators': signal_data['indicators'],
             'last_price': round(crypto_data['Close'].iloc[-1], 4),
-            'volume': int(crypto_data['Volume'].iloc[-1]) if 'Volume' in crypto_data.columns else None,
+            'volume': int(crypto_data['Volume'].iloc[-1]) if 'Volume' in crypto_data.columns and pd.notna(crypto_data['Volume'].iloc[-1]) else None,
             'price_change_24h': round(
                 ((crypto_data['Close'].iloc[-1] - crypto_data['Close'].iloc[-96]) / crypto_data['Close'].iloc[-96]) * 100, 2
-            ) if len(crypto_data) >= 96 else None
+            ) if len(crypto_data) >= 96 else None,
+            'data_source': DATA_SOURCE_LABELS.get(data_source, data_source)
         }
         
         return jsonify(response)
@@ -280,6 +225,6 @@ def get_supported_pairs():
 
 if __name__ == '__main__':
     print("🚀 Starting Crypto Signal Analysis API...")
-    print("📊 Supported indicators: RSI, EMA, Stochastic, MACD, Bollinger Bands")
+    print("📊 Supported indicators: RSI, EMA, Stochastic, MACD, Bollinger Bands, VWAP, ATR, OBV, ADX")
     print("💱 Ready to analyze crypto trading pairs!")
     app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
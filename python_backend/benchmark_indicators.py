@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark the fused indicator kernel against the per-indicator ta classes
+
+Usage: python benchmark_indicators.py [bars] [repeats]
+"""
+import sys
+import timeit
+import pandas as pd
+import numpy as np
+from ta.momentum import RSIIndicator, StochasticOscillator
+from ta.trend import EMAIndicator, MACD, ADXIndicator
+from ta.volatility import BollingerBands, AverageTrueRange
+from ta.volume import VolumeWeightedAveragePrice, OnBalanceVolumeIndicator
+from indicators import compute_indicators
+import warnings
+warnings.filterwarnings('ignore')
+
+
+def make_ohlcv(bars: int, seed: int = 42):
+    """Random-walk candles standing in for a fetched OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, bars)) * close
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.integers(1000, 100000, bars).astype(float)
+    }, index=pd.date_range('2024-01-01', periods=bars, freq='15min'))
+
+
+def ta_baseline(data: pd.DataFrame, extended: bool = True):
+    """Per-indicator ta calls, as the pipeline computed them before the kernel"""
+    stoch = StochasticOscillator(high=data['High'], low=data['Low'], close=data['Close'],
+                                 window=14, smooth_window=3)
+    macd = MACD(data['Close'])
+    bb = BollingerBands(data['Close'], window=20)
+    result = {
+        'rsi': RSIIndicator(data['Close'], window=14).rsi(),
+        'ema_short': EMAIndicator(data['Close'], window=12).ema_indicator(),
+        'ema_long': EMAIndicator(data['Close'], window=26).ema_indicator(),
+        'stoch_k': stoch.stoch(),
+        'stoch_d': stoch.stoch_signal(),
+        'macd': macd.macd(),
+        'macd_signal': macd.macd_signal(),
+        'bb_upper': bb.bollinger_hband(),
+        'bb_middle': bb.bollinger_mavg(),
+        'bb_lower': bb.bollinger_lband()
+    }
+
+    if extended:
+        result.update({
+            'vwap': VolumeWeightedAveragePrice(data['High'], data['Low'], data['Close'],
+                                               data['Volume'], window=14).volume_weighted_average_price(),
+            'atr': AverageTrueRange(data['High'], data['Low'], data['Close'], window=14).average_true_range(),
+            'obv': OnBalanceVolumeIndicator(data['Close'], data['Volume']).on_balance_volume(),
+            'adx': ADXIndicator(data['High'], data['Low'], data['Close'], window=14).adx()
+        })
+
+    return result
+
+
+# ta fills the warm-up bars of these with zeros instead of NaN
+ZERO_PADDED = ('atr', 'adx')
+
+
+def ta_warmup_as_nan(name: str, series: pd.Series):
+    """Replace ta's leading zero padding with NaN so warm-up bars line up with ours"""
+    if name not in ZERO_PADDED:
+        return series
+    nonzero = series.to_numpy() != 0
+    warmup = int(nonzero.argmax()) if nonzero.any() else len(series)
+    series = series.copy()
+    series.iloc[:warmup] = np.nan
+    return series
+
+
+def compare(ours: pd.Series, theirs: pd.Series):
+    """Whether NaN/warm-up positions match, and the largest difference elsewhere"""
+    same_gaps = bool((ours.isna() == theirs.isna()).all())
+    mask = ours.notna() & theirs.notna()
+    if not mask.any():
+        return same_gaps, float('nan')
+    return same_gaps, float((ours[mask] - theirs[mask]).abs().max())
+
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    tolerance = 1e-9
+    data = make_ohlcv(bars)
+
+    fused = compute_indicators(data)
+    baseline = ta_baseline(data)
+
+    print(f"Parity on {bars} bars (max abs diff vs ta):")
+    parity_ok = True
+    for name, series in baseline.items():
+        same_gaps, diff = compare(fused[name], ta_warmup_as_nan(name, series))
+        ok = same_gaps and diff <= tolerance
+        parity_ok = parity_ok and ok
+        note = '' if same_gaps else '  warm-up/NaN positions differ'
+        print(f"  {name:<12} {diff:.3e}  {'ok' if ok else 'MISMATCH'}{note}")
+
+    timings = {
+        'ta, 5 indicators': lambda: ta_baseline(data, extended=False),
+        'ta, 9 indicators': lambda: ta_baseline(data),
+        'fused, 9 indicators': lambda: compute_indicators(data)
+    }
+
+    print(f"\nTiming ({repeats} runs, {bars} bars):")
+    for label, fn in timings.items():
+        best = min(timeit.repeat(fn, number=repeats, repeat=3)) / repeats
+        print(f"  {label:<20} {best * 1000:8.2f} ms")
+
+    if not parity_ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import queue
+import threading
+try:
+    import fcntl
+except ImportError:  # Windows - stats merging falls back to last writer wins
+    fcntl = None
+import requests
+import pandas as pd
+import numpy as np
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Where the local store keeps cached candles and per-source routing stats.
+# analyze_pair.py runs as a fresh subprocess per request, so stats must live
+# on disk for latency tracking to carry over between calls.
+DEFAULT_STORE_DIR = os.environ.get(
+    'OHLCV_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.ohlcv_store')
+)
+
+# Display names for DataSource.name, shared by app.py and analyze_pair.py responses
+DATA_SOURCE_LABELS = {
+    'coingecko': 'CoinGecko API',
+    'yahoo': 'Yahoo Finance',
+    'local': 'Local store',
+}
+
+# Resample rule and bar length for each supported timeframe
+TIMEFRAMES = {
+    '1m': ('1min', pd.Timedelta(minutes=1)),
+    '5m': ('5min', pd.Timedelta(minutes=5)),
+    '15m': ('15min', pd.Timedelta(minutes=15)),
+    '1h': ('1h', pd.Timedelta(hours=1)),
+    '4h': ('4h', pd.Timedelta(hours=4)),
+    '1d': ('1D', pd.Timedelta(days=1)),
+    '1w': ('W-MON', pd.Timedelta(weeks=1))
+}
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str):
+    """Bring candles to the requested timeframe, or None if they are too coarse"""
+    if timeframe not in TIMEFRAMES or len(df) < 2:
+        return df
+
+    rule, bar = TIMEFRAMES[timeframe]
+    spacing = df.index.to_series().diff().median()
+    if spacing > bar * 1.5:
+        return None
+    if spacing > bar * 0.9:
+        return df
+
+    bars = df.resample(rule, label='left', closed='left')
+    resampled = pd.DataFrame({
+        'Open': bars['Open'].first(),
+        'High': bars['High'].max(),
+        'Low': bars['Low'].min(),
+        'Close': bars['Close'].last(),
+        'Volume': bars['Volume'].sum(min_count=1)
+    })
+    return resampled.dropna(subset=['Close'])
+
+
+def normalize_ohlcv(data, timeframe: str = None):
+    """Normalize a fetcher result into the shared OHLCV schema and bar interval"""
+    if data is None or data.empty:
+        return None
+
+    missing = [col for col in OHLCV_COLUMNS if col not in data.columns]
+    if 'Close' in missing:
+        return None
+
+    df = data.copy()
+    for col in ('Open', 'High', 'Low'):
+        if col in missing:
+            df[col] = df['Close']
+    if 'Volume' in missing:
+        df['Volume'] = np.nan
+
+    df = df[OHLCV_COLUMNS].astype(float)
+
+    # Yahoo returns tz-aware timestamps, CoinGecko naive UTC - align on naive UTC
+    df.index = pd.to_datetime(df.index)
+    if df.index.tz is not None:
+        df.index = df.index.tz_convert('UTC').tz_localize(None)
+    df.index.name = 'timestamp'
+
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    df = df.dropna(subset=['Close'])
+
+    # Sources differ in native granularity (CoinGecko picks it from the day range)
+    if timeframe is not None and not df.empty:
+        df = resample_ohlcv(df, timeframe)
+
+    return df if df is not None and not df.empty else None
+
+
+# CoinGecko ID mapping for common trading pairs
+PAIR_TO_COINGECKO_ID = {
+    'BTCUSDT': 'bitcoin',
+    'ETHUSDT': 'ethereum',
+    'ADAUSDT': 'cardano',
+    'DOTUSDT': 'polkadot',
+    'LINKUSDT': 'chainlink',
+    'BNBUSDT': 'binancecoin',
+    'SOLUSDT': 'solana',
+    'MATICUSDT': 'polygon',
+    'AVAXUSDT': 'avalanche-2',
+    'LTCUSDT': 'litecoin',
+    'XRPUSDT': 'ripple',
+    'ATOMUSDT': 'cosmos',
+    'ALGOUSDT': 'algorand',
+    'VETUSDT': 'vechain',
+    'FILUSDT': 'filecoin',
+    'PEPEUSDT': 'pepe',
+    'SHIBUSDT': 'shiba-inu',
+    'DOGEUSDT': 'dogecoin',
+    'FLOKIUSDT': 'floki',
+    'BONKUSDT': 'bonk',
+    'WIFUSDT': 'dogwifcoin',
+}
+
+
+def get_coingecko_id(symbol: str):
+    """Convert trading pair symbol to CoinGecko ID"""
+    # Try direct mapping first
+    if symbol in PAIR_TO_COINGECKO_ID:
+        return PAIR_TO_COINGECKO_ID[symbol]
+    
+    # Try to extract base currency and convert to lowercase
+    if symbol.endswith('USDT'):
+        base_currency = symbol[:-4].lower()
+        
+        # Common mappings for meme coins and others
+        special_mappings = {
+            'pepe': 'pepe',
+            'shib': 'shiba-inu',
+            'doge': 'dogecoin',
+            'floki': 'floki',
+            'bonk': 'bonk',
+            'wif': 'dogwifcoin',
+            'btc': 'bitcoin',
+            'eth': 'ethereum',
+            'ada': 'cardano',
+            'dot': 'polkadot',
+            'link': 'chainlink',
+            'bnb': 'binancecoin',
+            'sol': 'solana',
+            'matic': 'polygon',
+            'avax': 'avalanche-2',
+            'ltc': 'litecoin',
+            'xrp': 'ripple',
+            'atom': 'cosmos',
+            'algo': 'algorand',
+            'vet': 'vechain',
+            'fil': 'filecoin',
+        }
+        
+        return special_mappings.get(base_currency, base_currency)
+    
+    return symbol.lower()
+
+def get_coingecko_market_data(coin_id: str, days: int = 7):
+    """Fetch market chart data from CoinGecko and convert to OHLC"""
+    try:
+        url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
+        params = {
+            'vs_currency': 'usd',
+            'days': days
+            # Automatic interval based on days parameter (CoinGecko free plan)
+        }
+        
+        response = requests.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if 'prices' not in data or not data['prices']:
+            return None
+        
+        # Convert prices data to DataFrame
+        prices_df = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
+        
+        if len(prices_df) < 50:
+            return None
+        
+        # Convert timestamp to datetime
+        prices_df['timestamp'] = pd.to_datetime(prices_df['timestamp'], unit='ms')
+        
+        # Create OHLC data by grouping hourly prices
+        # Since we only have price data, we'll simulate OHLC by using price movements
+        df_list = []
+        for i in range(len(prices_df)):
+            if i == 0:
+                open_price = prices_df.iloc[i]['price']
+                high_price = prices_df.iloc[i]['price']
+                low_price = prices_df.iloc[i]['price']
+                close_price = prices_df.iloc[i]['price']
+            else:
+                # Use previous close as open
+                open_price = df_list[-1]['Close'] if df_list else prices_df.iloc[i-1]['price']
+                close_price = prices_df.iloc[i]['price']
+                
+                # Simulate high/low based on price movement
+                price_change = abs(close_price - open_price)
+                volatility_factor = price_change * 0.1  # Small volatility simulation
+                
+                high_price = max(open_price, close_price) + volatility_factor
+                low_price = min(open_price, close_price) - volatility_factor
+            
+            df_list.append({
+                'timestamp': prices_df.iloc[i]['timestamp'],
+                'Open': open_price,
+                'High': high_price,
+                'Low': low_price,
+                'Close': close_price,
+                'Volume': np.nan  # total_volumes is a rolling 24h total, not per-candle volume
+            })
+        
+        df = pd.DataFrame(df_list)
+        df.set_index('timestamp', inplace=True)
+        
+        return df[['Open', 'High', 'Low', 'Close', 'Volume']]
+        
+    except Exception as e:
+        print(f"Error fetching CoinGecko market data for {coin_id}: {e}", file=sys.stderr)
+        return None
+
+
+def to_yahoo_symbol(pair: str):
+    """Convert a trading pair into Yahoo Finance format (BTCUSDT -> BTC-USD)"""
+    if pair.endswith('-USD'):
+        return pair
+    return pair.replace('USDT', '-USD').replace('BUSD', '-USD')
+
+
+def to_exchange_pair(pair: str):
+    """Convert a trading pair into exchange format (BTC-USD -> BTCUSDT)"""
+    if pair.endswith('-USD'):
+        return pair[:-4] + 'USDT'
+    return pair
+
+
+class SourceStats:
+    """Rolling latency and error history for one data source"""
+
+    def __init__(self, window: int = 50, latencies=None, outcomes=None, last_failure: float = 0.0):
+        self.window = window
+        self.latencies = list(latencies or [])[-window:]
+        self.outcomes = list(outcomes or [])[-window:]
+        self.last_failure = last_failure
+
+    def record_success(self, latency: float):
+        self.latencies = (self.latencies + [latency])[-self.window:]
+        self.outcomes = (self.outcomes + [1])[-self.window:]
+
+    def record_latency(self, latency: float):
+        # Lower bound from a request abandoned while still running
+        self.latencies = (self.latencies + [latency])[-self.window:]
+
+    def record_failure(self, latency: float = None, at: float = None):
+        # Timeouts and errors still tell us how long the source made us wait
+        if latency is not None:
+            self.latencies = (self.latencies + [latency])[-self.window:]
+        self.outcomes = (self.outcomes + [0])[-self.window:]
+        self.last_failure = max(self.last_failure, at if at is not None else time.time())
+
+    def record(self, kind: str, latency: float, at: float = None):
+        """Record a 'success', 'failure' or abandoned-request 'latency' sample"""
+        if kind == 'success':
+            self.record_success(latency)
+        elif kind == 'failure':
+            self.record_failure(latency, at)
+        else:
+            self.record_latency(latency)
+
+    @property
+    def error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+    def latency_percentile(self, q: float):
+        if not self.latencies:
+            return None
+        return float(np.percentile(self.latencies, q))
+
+    def to_dict(self):
+        return {
+            'latencies': self.latencies,
+            'outcomes': self.outcomes,
+            'last_failure': self.last_failure
+        }
+
+
+class DataSource:
+    """Base class for OHLCV data sources used by the router"""
+    name = 'base'
+
+    def supports(self, timeframe: str):
+        return True
+
+    def fetch(self, pair: str, timeframe: str):
+        raise NotImplementedError
+
+
+class YahooFinanceSource(DataSource):
+    """OHLCV candles from Yahoo Finance via yfinance"""
+    name = 'yahoo'
+
+    timeframe_map = {
+        '1m': '1m',
+        '5m': '5m',
+        '15m': '15m',
+        '1h': '1h',
+        '4h': '1h',  # yfinance has no 4h interval; resampled by normalize_ohlcv
+        '1d': '1d',
+        '1w': '1wk'
+    }
+
+    # Enough history for generate_signal's 50-bar minimum at each interval
+    period_by_timeframe = {
+        '1m': '5d',
+        '5m': '5d',
+        '15m': '5d',
+        '1h': '1mo',
+        '4h': '1mo',
+        '1d': '1y',
+        '1w': '5y'
+    }
+
+    def supports(self, timeframe: str):
+        return timeframe in self.timeframe_map
+
+    def fetch(self, pair: str, timeframe: str):
+        import yfinance as yf
+
+        ticker = yf.Ticker(to_yahoo_symbol(pair))
+        interval = self.timeframe_map[timeframe]
+        return ticker.history(period=self.period_by_timeframe[timeframe], interval=interval)
+
+
+class CoinGeckoSource(DataSource):
+    """OHLCV candles built from the CoinGecko market chart"""
+    name = 'coingecko'
+
+    # CoinGecko's free plan picks granularity from the range: 1 day gives
+    # 5-minute points, up to 90 days hourly, beyond that daily
+    days_by_timeframe = {
+        '5m': 1,
+        '15m': 1,
+        '1h': 7,
+        '4h': 30,
+        '1d': 180,
+        '1w': 730
+    }
+
+    def supports(self, timeframe: str):
+        return timeframe in self.days_by_timeframe
+
+    def fetch(self, pair: str, timeframe: str):
+        coin_id = get_coingecko_id(to_exchange_pair(pair))
+        return get_coingecko_market_data(coin_id, days=self.days_by_timeframe[timeframe])
+
+
+class LocalStoreSource(DataSource):
+    """Candles cached on disk from earlier upstream fetches"""
+    name = 'local'
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, max_age: float = 60.0):
+        self.root = root
+        self.max_age = max_age
+
+    def _path(self, pair: str, timeframe: str):
+        safe_pair = ''.join(c for c in pair if c.isalnum() or c in '-_')
+        return os.path.join(self.root, f"{safe_pair}_{timeframe}.csv")
+
+    def age(self, pair: str, timeframe: str):
+        path = self._path(pair, timeframe)
+        if not os.path.exists(path):
+            return None
+        return time.time() - os.path.getmtime(path)
+
+    def fetch(self, pair: str, timeframe: str, max_age: float = None):
+        max_age = self.max_age if max_age is None else max_age
+        try:
+            age = self.age(pair, timeframe)
+            if age is None or age > max_age:
+                return None
+            cached = pd.read_csv(self._path(pair, timeframe), index_col='timestamp', parse_dates=True)
+            return normalize_ohlcv(cached, timeframe)
+        except (OSError, ValueError) as e:
+            # A truncated or foreign file is a cache miss, not a failed request
+            print(f"Error reading local store for {pair}: {e}", file=sys.stderr)
+            return None
+
+    def store(self, pair: str, timeframe: str, data: pd.DataFrame):
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            path = self._path(pair, timeframe)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            data.to_csv(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing local store for {pair}: {e}", file=sys.stderr)
+
+
+class DataRouter:
+    """Route OHLCV requests to the fastest healthy source, hedging slow calls"""
+
+    def __init__(self, sources=None, local_store: LocalStoreSource = None,
+                 stats_path: str = None, max_error_rate: float = 0.5,
+                 cooldown: float = 60.0, hedge_percentile: float = 95,
+                 default_hedge_delay: float = 2.0, min_hedge_delay: float = 0.25,
+                 timeout: float = 15.0, min_bars: int = 50):
+        self.sources = list(sources) if sources is not None else [YahooFinanceSource(), CoinGeckoSource()]
+        self.local_store = local_store if local_store is not None else LocalStoreSource()
+        self.stats_path = stats_path or os.path.join(self.local_store.root, 'router_stats.json')
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.timeout = timeout
+        self.min_bars = min_bars
+        self._lock = threading.Lock()
+        self.stats = self._load_stats()
+        # Samples recorded since the last save, replayed onto the file's latest contents
+        self._unsaved = []
+
+    def _read_stats_file(self):
+        try:
+            with open(self.stats_path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return saved if isinstance(saved, dict) else {}
+
+    def _load_stats(self, saved: dict = None):
+        stats = {}
+        saved = self._read_stats_file() if saved is None else saved
+
+        for source in self.sources:
+            try:
+                stats[source.name] = SourceStats(**saved.get(source.name, {}))
+            except TypeError:
+                stats[source.name] = SourceStats()
+        return stats
+
+    def _record(self, name: str, kind: str, latency: float):
+        """Record a sample in memory and queue it for the next save (caller holds the lock)"""
+        at = time.time()
+        self.stats[name].record(kind, latency, at)
+        self._unsaved.append((name, kind, latency, at))
+
+    def _save_stats(self):
+        """Merge this process's new samples into the shared stats file"""
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, []
+
+        try:
+            os.makedirs(os.path.dirname(self.stats_path), exist_ok=True)
+            # app.py and every analyze_pair.py subprocess share this file, so
+            # re-read it under a lock and replay our samples instead of overwriting
+            with open(f"{self.stats_path}.lock", 'w') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                saved = self._read_stats_file()
+                merged = self._load_stats(saved)
+                for name, kind, latency, at in unsaved:
+                    merged[name].record(kind, latency, at)
+
+                # Sources this router doesn't know about are kept as they were
+                saved.update({name: s.to_dict() for name, s in merged.items()})
+                tmp_path = f"{self.stats_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(saved, f)
+                os.replace(tmp_path, self.stats_path)
+        except OSError as e:
+            print(f"Error saving router stats: {e}", file=sys.stderr)
+            with self._lock:
+                self._unsaved = unsaved + self._unsaved
+            return
+
+        with self._lock:
+            # Keep samples from threads that finished while we were writing
+            for name, kind, latency, at in self._unsaved:
+                merged[name].record(kind, latency, at)
+            self.stats = merged
+
+    def is_healthy(self, source: DataSource):
+        stats = self.stats[source.name]
+        if stats.error_rate <= self.max_error_rate:
+            return True
+        # Let a failing source back in for a probe once the cooldown expires
+        return time.time() - stats.last_failure > self.cooldown
+
+    def ranked_sources(self):
+        """Healthy sources ordered by median latency, unhealthy ones last"""
+        def sort_key(indexed):
+            index, source = indexed
+            median = self.stats[source.name].latency_percentile(50)
+            # Sources without history keep their configured order ahead of measured ones
+            return (not self.is_healthy(source), median is not None, median or 0.0, index)
+
+        return [source for _, source in sorted(enumerate(self.sources), key=sort_key)]
+
+    def hedge_delay(self, source: DataSource):
+        p95 = self.stats[source.name].latency_percentile(self.hedge_percentile)
+        if p95 is None:
+            return self.default_hedge_delay
+        return max(p95, self.min_hedge_delay)
+
+    def _run(self, source: DataSource, pair: str, timeframe: str, results: queue.Queue, inflight: dict):
+        start = time.perf_counter()
+        try:
+            data = normalize_ohlcv(source.fetch(pair, timeframe), timeframe)
+            if data is None:
+                error = 'no data'
+            elif len(data) < self.min_bars:
+                # Too short to analyze - fail over rather than let it win and get cached
+                data, error = None, f"only {len(data)} bars"
+            else:
+                error = None
+        except Exception as e:
+            data, error = None, str(e)
+        latency = time.perf_counter() - start
+
+        with self._lock:
+            # Requests abandoned by fetch() were already recorded with their elapsed time
+            if inflight.pop(source.name, None) is not None:
+                self._record(source.name, 'success' if data is not None else 'failure', latency)
+
+        if error:
+            print(f"Error fetching data for {pair} from {source.name}: {error}", file=sys.stderr)
+        results.put((source, data, latency))
+
+    def _start(self, source: DataSource, pair: str, timeframe: str, results: queue.Queue, inflight: dict):
+        with self._lock:
+            inflight[source.name] = time.perf_counter()
+        # Daemon threads so a hung loser never blocks interpreter exit
+        thread = threading.Thread(target=self._run, args=(source, pair, timeframe, results, inflight), daemon=True)
+        thread.start()
+
+    def _record_abandoned(self, inflight: dict, winner_latency: float = None):
+        """Record sources still running when fetch() returns, using the time elapsed so far"""
+        now = time.perf_counter()
+        with self._lock:
+            for name, started in inflight.items():
+                elapsed = now - started
+                if winner_latency is None:
+                    # Nothing answered before the deadline
+                    self._record(name, 'failure', elapsed)
+                elif elapsed >= winner_latency:
+                    # Already slower than the winner; a hedge cut short sooner tells us nothing
+                    self._record(name, 'latency', elapsed)
+            inflight.clear()
+
+    def fetch(self, pair: str, timeframe: str = '15m'):
+        """Fetch normalized OHLCV data, returning (data, source_name)"""
+        cached = self.local_store.fetch(pair, timeframe)
+        if cached is not None and len(cached) >= self.min_bars:
+            return cached, self.local_store.name
+
+        candidates = [source for source in self.ranked_sources() if source.supports(timeframe)]
+        results = queue.Queue()
+        inflight = {}
+        deadline = time.monotonic() + self.timeout
+        pending = 0
+        data, winner, winner_latency = None, None, None
+
+        if candidates:
+            self._start(candidates[0], pair, timeframe, results, inflight)
+            pending = 1
+            next_index = 1
+            wait = self.hedge_delay(candidates[0])
+
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    source, result, latency = results.get(timeout=min(wait, remaining) if wait is not None else remaining)
+                except queue.Empty:
+                    # Primary is slower than its p95 - hedge with the next source
+                    if next_index < len(candidates):
+                        self._start(candidates[next_index], pair, timeframe, results, inflight)
+                        pending += 1
+                        next_index += 1
+                    wait = None
+                    continue
+
+                pending -= 1
+                if result is not None:
+                    data, winner, winner_latency = result, source.name, latency
+                    break
+                # Failed outright - fail over immediately rather than waiting out the hedge delay
+                if next_index < len(candidates):
+                    self._start(candidates[next_index], pair, timeframe, results, inflight)
+                    pending += 1
+                    next_index += 1
+                    wait = self.hedge_delay(candidates[next_index - 1])
+
+        # Losers and timed-out requests would otherwise never be measured, since
+        # analyze_pair.py exits (killing their daemon threads) as soon as this returns
+        self._record_abandoned(inflight, winner_latency)
+        self._save_stats()
+
+        if data is not None:
+            self.local_store.store(pair, timeframe, data)
+            return data, winner
+
+        # Every upstream failed - a stale candle set beats no answer at all
+        stale = self.local_store.fetch(pair, timeframe, max_age=float('inf'))
+        if stale is not None and len(stale) >= self.min_bars:
+            return stale, self.local_store.name
+
+        return None, None
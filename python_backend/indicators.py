@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _rolling(values: np.ndarray, window: int):
+    """Sliding windows over values, aligned so row i ends at bar window - 1 + i"""
+    if len(values) < window:
+        return np.empty((0, window))
+    return sliding_window_view(values, window)
+
+
+def _align(values: np.ndarray, n: int):
+    """Left-pad a rolling result with NaN so it lines up with the input bars"""
+    out = np.full(n, np.nan)
+    if len(values):
+        out[n - len(values):] = values
+    return out
+
+
+def compute_indicators(data: pd.DataFrame, rsi_period: int = 14, ema_short: int = 12,
+                       ema_long: int = 26, macd_signal: int = 9, stoch_period: int = 14,
+                       stoch_smooth: int = 3, bb_period: int = 20, bb_dev: float = 2.0,
+                       vwap_period: int = 14, atr_period: int = 14, adx_period: int = 14):
+    """Calculate all technical indicators from one set of shared intermediates
+
+    True range, gains/losses and directional movement are computed once.
+    EMA, MACD, RSI, ATR, ADX and OBV advance together in a single loop;
+    Bollinger Bands, Stochastic and VWAP are vectorized over sliding windows.
+    Produces the same values as the per-indicator ta classes, except that
+    warm-up bars are NaN rather than ta's zeros for ATR and ADX.
+    """
+    high = data['High'].to_numpy(dtype=float)
+    low = data['Low'].to_numpy(dtype=float)
+    close = data['Close'].to_numpy(dtype=float)
+    if 'Volume' in data.columns:
+        volume = data['Volume'].to_numpy(dtype=float)
+    else:
+        volume = np.full(len(close), np.nan)
+    n = len(close)
+
+    # Shared intermediates: previous close, price change and true range
+    prev_close = np.empty(n)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    change = close - prev_close
+    gain = np.where(change > 0, change, 0.0)
+    loss = np.where(change < 0, -change, 0.0)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+    up_move = np.empty(n)
+    down_move = np.empty(n)
+    up_move[:1] = down_move[:1] = np.nan
+    up_move[1:] = high[1:] - high[:-1]
+    down_move[1:] = low[:-1] - low[1:]
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    # Rolling-window indicators share one strided view per input series
+    close_windows = _rolling(close, bb_period)
+    bb_middle = _align(close_windows.mean(axis=1), n)
+    bb_std = _align(close_windows.std(axis=1), n)
+
+    lowest_low = _align(_rolling(low, stoch_period).min(axis=1), n)
+    highest_high = _align(_rolling(high, stoch_period).max(axis=1), n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = 100 * (close - lowest_low) / (highest_high - lowest_low)
+    stoch_d = _align(_rolling(stoch_k, stoch_smooth).mean(axis=1), n)
+
+    typical_price = (high + low + close) / 3.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = (_align(_rolling(typical_price * volume, vwap_period).sum(axis=1), n)
+                / _align(_rolling(volume, vwap_period).sum(axis=1), n))
+
+    # Recursive indicators advance together in one loop over plain floats
+    ema_s_out = np.full(n, np.nan)
+    ema_l_out = np.full(n, np.nan)
+    macd_signal_out = np.full(n, np.nan)
+    rsi_out = np.full(n, np.nan)
+    atr_out = np.full(n, np.nan)
+    plus_di_out = np.full(n, np.nan)
+    minus_di_out = np.full(n, np.nan)
+    adx_out = np.full(n, np.nan)
+    obv_out = np.empty(n)
+
+    closes = close.tolist()
+    gains = gain.tolist()
+    losses = loss.tolist()
+    trs = true_range.tolist()
+    plus_dms = plus_dm.tolist()
+    minus_dms = minus_dm.tolist()
+    volumes = volume.tolist()
+
+    alpha_s = 2.0 / (ema_short + 1)
+    alpha_l = 2.0 / (ema_long + 1)
+    alpha_sig = 2.0 / (macd_signal + 1)
+    alpha_rsi = 1.0 / rsi_period
+
+    ema_s = ema_l = sig = None
+    avg_gain = avg_loss = None
+    atr = 0.0
+    tr_sum = plus_dm_sum = minus_dm_sum = 0.0
+    dx_sum = 0.0
+    adx = None
+    obv = 0.0
+
+    for i in range(n):
+        price = closes[i]
+
+        # EMA / MACD (pandas ewm, adjust=False, seeded from the first value)
+        if i == 0:
+            ema_s = ema_l = price
+            avg_gain, avg_loss = gains[0], losses[0]
+        else:
+            ema_s += alpha_s * (price - ema_s)
+            ema_l += alpha_l * (price - ema_l)
+            avg_gain += alpha_rsi * (gains[i] - avg_gain)
+            avg_loss += alpha_rsi * (losses[i] - avg_loss)
+
+        if i >= ema_short - 1:
+            ema_s_out[i] = ema_s
+        if i >= ema_long - 1:
+            ema_l_out[i] = ema_l
+            macd = ema_s - ema_l
+            sig = macd if sig is None else sig + alpha_sig * (macd - sig)
+            if i >= ema_long + macd_signal - 2:
+                macd_signal_out[i] = sig
+
+        # RSI (Wilder smoothing of gains/losses)
+        if i >= rsi_period - 1:
+            rsi_out[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        # ATR (seeded with the mean true range of the first window)
+        if i < atr_period:
+            atr += trs[i] / atr_period
+            if i == atr_period - 1:
+                atr_out[i] = atr
+        else:
+            atr = (atr * (atr_period - 1) + trs[i]) / atr_period
+            atr_out[i] = atr
+
+        # ADX (Wilder sums of TR and directional movement from bar 1 onwards)
+        if 1 <= i <= adx_period:
+            tr_sum += trs[i]
+            plus_dm_sum += plus_dms[i]
+            minus_dm_sum += minus_dms[i]
+        elif i > adx_period:
+            tr_sum += trs[i] - tr_sum / adx_period
+            plus_dm_sum += plus_dms[i] - plus_dm_sum / adx_period
+            minus_dm_sum += minus_dms[i] - minus_dm_sum / adx_period
+
+        if i >= adx_period and tr_sum > 0:
+            plus_di = 100.0 * plus_dm_sum / tr_sum
+            minus_di = 100.0 * minus_dm_sum / tr_sum
+            plus_di_out[i] = plus_di
+            minus_di_out[i] = minus_di
+            di_total = plus_di + minus_di
+            dx = 100.0 * abs(plus_di - minus_di) / di_total if di_total > 0 else 0.0
+
+            if i < 2 * adx_period - 1:
+                dx_sum += dx
+            elif adx is None:
+                adx = (dx_sum + dx) / adx_period
+                adx_out[i] = adx
+            else:
+                adx = (adx * (adx_period - 1) + dx) / adx_period
+                adx_out[i] = adx
+
+        # OBV (a flat close counts as up-volume, matching ta)
+        if i > 0 and price < closes[i - 1]:
+            obv -= volumes[i]
+        else:
+            obv += volumes[i]
+        obv_out[i] = obv
+
+    bb_upper = bb_middle + bb_dev * bb_std
+    bb_lower = bb_middle - bb_dev * bb_std
+    macd_out = ema_s_out - ema_l_out
+    macd_out[:ema_long - 1] = np.nan
+
+    index = data.index
+    return {
+        'rsi': pd.Series(rsi_out, index=index),
+        'ema_short': pd.Series(ema_s_out, index=index),
+        'ema_long': pd.Series(ema_l_out, index=index),
+        'stoch_k': pd.Series(stoch_k, index=index),
+        'stoch_d': pd.Series(stoch_d, index=index),
+        'macd': pd.Series(macd_out, index=index),
+        'macd_signal': pd.Series(macd_signal_out, index=index),
+        'macd_diff': pd.Series(macd_out - macd_signal_out, index=index),
+        'bb_upper': pd.Series(bb_upper, index=index),
+        'bb_middle': pd.Series(bb_middle, index=index),
+        'bb_lower': pd.Series(bb_lower, index=index),
+        'vwap': pd.Series(vwap, index=index),
+        'atr': pd.Series(atr_out, index=index),
+        'obv': pd.Series(obv_out, index=index),
+        'adx': pd.Series(adx_out, index=index),
+        'plus_di': pd.Series(plus_di_out, index=index),
+        'minus_di': pd.Series(minus_di_out, index=index)
+    }
+
+
+def _latest(series: pd.Series):
+    """Last value of a series, or None when missing"""
+    if series is None or series.empty or pd.isna(series.iloc[-1]):
+        return None
+    return float(series.iloc[-1])
+
+
+def score_extended_indicators(data: pd.DataFrame, indicators: dict, obv_lookback: int = 14,
+                              adx_threshold: float = 25.0):
+    """Score VWAP, OBV and ADX as extra signal components
+
+    Returns (buy_signals, sell_signals, total_signals) to add to the base score.
+    Volume components are skipped when the source has no real volume.
+    """
+    buy_signals = 0
+    sell_signals = 0
+    total_signals = 0
+
+    current_price = float(data['Close'].iloc[-1])
+    volume = data['Volume'] if 'Volume' in data.columns else None
+    has_volume = volume is not None and volume.notna().all() and volume.nunique() > 1
+
+    # VWAP (price above the volume-weighted average is bullish)
+    latest_vwap = _latest(indicators.get('vwap'))
+    if has_volume and latest_vwap is not None:
+        if current_price > latest_vwap:
+            buy_signals += 1
+        elif current_price < latest_vwap:
+            sell_signals += 1
+        total_signals += 1
+
+    # OBV (rising volume flow confirms buying pressure)
+    obv = indicators.get('obv')
+    if has_volume and obv is not None and len(obv) > obv_lookback:
+        obv_change = obv.iloc[-1] - obv.iloc[-1 - obv_lookback]
+        if obv_change > 0:
+            buy_signals += 1
+        elif obv_change < 0:
+            sell_signals += 1
+        total_signals += 1
+
+    # ADX (only votes when a trend is strong enough to follow)
+    latest_adx = _latest(indicators.get('adx'))
+    latest_plus_di = _latest(indicators.get('plus_di'))
+    latest_minus_di = _latest(indicators.get('minus_di'))
+    if latest_adx is not None and latest_adx > adx_threshold and latest_plus_di is not None and latest_minus_di is not None:
+        if latest_plus_di > latest_minus_di:
+            buy_signals += 1.5
+        else:
+            sell_signals += 1.5
+        total_signals += 1.5
+
+    return buy_signals, sell_signals, total_signals
+
+
+def extended_indicator_values(indicators: dict):
+    """Latest VWAP, ATR, OBV and ADX values for the API response"""
+    values = {}
+    for name, digits in (('vwap', 10), ('atr', 10), ('obv', 2), ('adx', 2)):
+        latest = _latest(indicators.get(name))
+        values[name] = round(latest, digits) if latest is not None else None
+    return values